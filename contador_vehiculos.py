@@ -1,5 +1,6 @@
 import cv2
 from ultralytics import YOLO
+from pool_frames import PoolFrames
 
 # Cargar modelo YOLOv8 nano
 model = YOLO("yolov8n.pt")
@@ -7,6 +8,10 @@ model = YOLO("yolov8n.pt")
 # Cargar video
 cap = cv2.VideoCapture("test2.mp4")
 
+# Pool de buffers para reutilizar la memoria de los frames
+pool = PoolFrames.desde_captura(cap)
+frame = None
+
 # Diccionario para almacenar IDs únicos
 conteo_ids = {
     'person': set(),
@@ -19,7 +24,9 @@ x1_roi, y1_roi = 80, 100
 x2_roi, y2_roi = 700, 480
 
 while cap.isOpened():
-    ret, frame = cap.read()
+    # Devolver el frame anterior al pool antes de decodificar el siguiente
+    pool.devolver(frame)
+    ret, frame = pool.leer(cap)
     if not ret:
         break
 
@@ -28,9 +35,11 @@ while cap.isOpened():
 
     boxes = results.boxes
     if boxes is not None and boxes.id is not None:
-        ids = boxes.id.cpu().numpy().astype(int)
-        cls = boxes.cls.cpu().numpy().astype(int)
-        coords = boxes.xyxy.cpu().numpy().astype(int)
+        # Una sola conversión a enteros: columnas (x1, y1, x2, y2, id, conf, cls)
+        datos = pool.cajas(boxes.data)
+        ids = datos[:, 4]
+        cls = datos[:, 6]
+        coords = datos[:, :4]
 
         for track_id, class_id, (x1, y1, x2, y2) in zip(ids, cls, coords):
             cls_name = model.names[class_id]
@@ -0,0 +1,181 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Renderizado sin ventana
+
+import argparse
+import csv
+import random
+import cv2
+import numpy as np
+import pygame
+import simulacion as sim
+
+ORIGINS = ["TOP", "LEFT", "RIGHT"]
+
+# Fracción mínima del vehículo que debe verse para contarlo como detectable
+VISIBILIDAD_MINIMA = 0.5
+
+# "detectables" es el conteo real contra el que se compara el detector;
+# "visibles" incluye también los vehículos tapados por otros
+CAMPOS_CONTEO = ["frame", "tiempo_ms", "detectables", "visibles", "visibles_top",
+                 "visibles_left", "visibles_right", "esperando", "generados", "salidos"]
+
+def pintar_ocupacion(mascara, lights, vehicles):
+    """Marca qué vehículo se ve en cada pixel, en el mismo orden que draw_scene"""
+    alto, ancho = mascara.shape
+    mascara.fill(-1)
+    for indice, vehicle in enumerate(vehicles):
+        x, y = int(vehicle.x), int(vehicle.y)
+        mascara[max(0, y):max(0, min(alto, y + vehicle.size)),
+                max(0, x):max(0, min(ancho, x + vehicle.size))] = indice
+    # Los semáforos se dibujan encima de los vehículos
+    for light in lights.values():
+        x, y = light.position[0] - 10, light.position[1] - 30
+        mascara[max(0, y):y + 60, max(0, x):x + 20] = -1
+
+def entrada_ocupada(nuevo, vehicles, min_gap):
+    """Indica si el vehículo nuevo quedaría encimado con otro de su carril"""
+    if min_gap is None:
+        return False
+    return any(vehicle.origin == nuevo.origin and vehicle.lane == nuevo.lane and
+               sim.gap_to_leader(nuevo, vehicle) < min_gap for vehicle in vehicles)
+
+def contar_vehiculos(frame_idx, tiempo_ms, vehicles, generados, salidos, mascara):
+    """Conteo real (ground truth) de vehículos en el frame"""
+    # Pixeles visibles de cada vehículo según la máscara de ocupación
+    pixeles = np.bincount(mascara[mascara >= 0], minlength=len(vehicles))
+
+    conteo = {
+        "frame": frame_idx,
+        "tiempo_ms": tiempo_ms,
+        "detectables": 0,
+        "visibles": 0,
+        "visibles_top": 0,
+        "visibles_left": 0,
+        "visibles_right": 0,
+        "esperando": 0,
+        "generados": generados,
+        "salidos": salidos
+    }
+    for indice, vehicle in enumerate(vehicles):
+        if pixeles[indice] >= VISIBILIDAD_MINIMA * vehicle.size * vehicle.size:
+            conteo["detectables"] += 1
+        # Solo cuentan los vehículos que aparecen dentro de la imagen
+        if (vehicle.x + vehicle.size > 0 and vehicle.x < sim.WIDTH and
+                vehicle.y + vehicle.size > 0 and vehicle.y < sim.HEIGHT):
+            conteo["visibles"] += 1
+            conteo[f"visibles_{vehicle.origin.lower()}"] += 1
+        if vehicle.stopped:
+            conteo["esperando"] += 1
+    return conteo
+
+def generar_frames(duracion=30.0, spawn_rate=sim.SPAWN_RATE, resolucion=None,
+                   max_vehiculos=None, semilla=None, min_gap=sim.MIN_GAP):
+    """Genera frames BGR de la simulación junto con su conteo real.
+
+    La simulación avanza con un reloj simulado de 1000/FPS ms por frame, así que
+    corre tan rápido como se pueda renderizar. El frame entregado es un buffer
+    reutilizado: hay que copiarlo si se quiere conservar.
+
+    Con min_gap los vehículos hacen cola sin encimarse y no se generan nuevos
+    mientras la entrada del carril esté ocupada (None = comportamiento original).
+    """
+    if semilla is not None:
+        random.seed(semilla)
+    pygame.init()
+
+    escena = pygame.Surface((sim.WIDTH, sim.HEIGHT))
+    ancho, alto = resolucion or (sim.WIDTH, sim.HEIGHT)
+    salida = escena if (ancho, alto) == (sim.WIDTH, sim.HEIGHT) else pygame.Surface((ancho, alto))
+    frame = np.empty((alto, ancho, 3), dtype=np.uint8)
+    mascara = np.empty((sim.HEIGHT, sim.WIDTH), dtype=np.int32)
+
+    paso_ms = 1000 / sim.FPS
+    total_frames = int(duracion * sim.FPS)
+    tiempo_ms = 0
+    spawn_timer = 0
+    generados = 0
+    salidos = 0
+
+    vehicles = []
+    lights = sim.create_lights(tiempo_ms)
+    lights["TOP"].change_to_green(tiempo_ms)
+
+    for frame_idx in range(total_frames):
+        # Generar vehículos hasta alcanzar el límite pedido
+        spawn_timer += paso_ms
+        if spawn_timer > spawn_rate:
+            if max_vehiculos is None or generados < max_vehiculos:
+                nuevo = sim.Vehicle(random.choice(ORIGINS))
+                if not entrada_ocupada(nuevo, vehicles, min_gap):
+                    vehicles.append(nuevo)
+                    generados += 1
+            spawn_timer = 0
+
+        sim.update_lights(lights, vehicles, tiempo_ms)
+        salidos += sim.update_vehicles(lights, vehicles, min_gap=min_gap)
+        sim.draw_scene(escena, lights, vehicles)
+        pintar_ocupacion(mascara, lights, vehicles)
+
+        if salida is not escena:
+            pygame.transform.smoothscale(escena, (ancho, alto), salida)
+
+        # pixels3d es (ancho, alto, RGB); se copia al buffer como (alto, ancho, BGR)
+        pixeles = pygame.surfarray.pixels3d(salida)
+        np.copyto(frame, pixeles.transpose(1, 0, 2)[:, :, ::-1])
+        del pixeles  # Libera el bloqueo de la superficie
+
+        yield frame, contar_vehiculos(frame_idx, round(tiempo_ms), vehicles, generados, salidos, mascara)
+        tiempo_ms += paso_ms
+
+def generar_video(ruta, **kwargs):
+    """Escribe la simulación en un video y el conteo real en un CSV al lado"""
+    resolucion = kwargs.get("resolucion") or (sim.WIDTH, sim.HEIGHT)
+    ruta_csv = os.path.splitext(ruta)[0] + ".csv"
+
+    writer = cv2.VideoWriter(ruta, cv2.VideoWriter_fourcc(*"mp4v"), sim.FPS, resolucion)
+    if not writer.isOpened():
+        raise IOError(f"No se pudo crear el video '{ruta}'")
+
+    conteo = None
+    try:
+        with open(ruta_csv, 'w', newline='', encoding='utf-8') as f:
+            csv_writer = csv.DictWriter(f, fieldnames=CAMPOS_CONTEO)
+            csv_writer.writeheader()
+            for frame, conteo in generar_frames(**kwargs):
+                writer.write(frame)
+                csv_writer.writerow(conteo)
+    finally:
+        writer.release()
+
+    return ruta_csv, conteo
+
+def main():
+    parser = argparse.ArgumentParser(description="Generador de videos sintéticos a partir de simulacion.py")
+    parser.add_argument("salida", help="ruta del video a generar (ej. sintetico.mp4)")
+    parser.add_argument("--duracion", type=float, default=30.0, help="duración en segundos")
+    parser.add_argument("--spawn-rate", type=int, default=sim.SPAWN_RATE, help="ms entre generación de vehículos")
+    parser.add_argument("--ancho", type=int, default=sim.WIDTH)
+    parser.add_argument("--alto", type=int, default=sim.HEIGHT)
+    parser.add_argument("--max-vehiculos", type=int, default=None, help="total de vehículos a generar")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--min-gap", type=int, default=sim.MIN_GAP,
+                        help="separación mínima en cola (negativo = permitir encimarse)")
+    args = parser.parse_args()
+
+    ruta_csv, conteo = generar_video(
+        args.salida,
+        duracion=args.duracion,
+        spawn_rate=args.spawn_rate,
+        resolucion=(args.ancho, args.alto),
+        max_vehiculos=args.max_vehiculos,
+        semilla=args.semilla,
+        min_gap=args.min_gap if args.min_gap >= 0 else None
+    )
+
+    print(f"Video generado: {args.salida}")
+    print(f"Conteo real: {ruta_csv}")
+    if conteo is not None:
+        print(f"Vehículos generados: {conteo['generados']}  Salidos: {conteo['salidos']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import cv2
+import numpy as np
+from collections import deque
+
+class PoolFrames:
+    """Pool de buffers reutilizables para frames, overlays y cajas de deteccion"""
+    def __init__(self, alto, ancho, canales=3, tamano=3, max_cajas=64):
+        self.forma = (alto, ancho, canales)
+        self.tamano = tamano
+        self.libres = deque(np.empty(self.forma, dtype=np.uint8) for _ in range(tamano))
+
+        # Buffer de enteros para las cajas (x1, y1, x2, y2, id, conf, cls)
+        self.buffer_cajas = np.empty((max_cajas, 7), dtype=np.int64)
+
+    @classmethod
+    def desde_captura(cls, cap, **kwargs):
+        """Crea el pool con la resolucion del video"""
+        alto = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        ancho = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        return cls(alto, ancho, **kwargs)
+
+    def tomar(self):
+        """Presta un buffer libre (solo reserva memoria si el pool está vacío)"""
+        if self.libres:
+            return self.libres.popleft()
+        return np.empty(self.forma, dtype=np.uint8)
+
+    def devolver(self, buffer):
+        """Devuelve un buffer al pool para reutilizarlo (sin superar el tamaño)"""
+        if buffer is not None and buffer.shape == self.forma and len(self.libres) < self.tamano:
+            self.libres.append(buffer)
+
+    def leer(self, cap):
+        """Decodifica el siguiente frame directamente sobre un buffer del pool"""
+        buffer = self.tomar()
+        ret, frame = cap.read(buffer)
+        if not ret or frame is not buffer:
+            # OpenCV no usó el buffer (fin del video o resolución distinta)
+            self.devolver(buffer)
+        return ret, frame
+
+    def copiar(self, frame):
+        """Copia un frame sobre un buffer prestado del pool"""
+        if frame.shape != self.forma:
+            # Resolución distinta a la reportada por la captura
+            return frame.copy()
+        buffer = self.tomar()
+        np.copyto(buffer, frame)
+        return buffer
+
+    def cajas(self, datos):
+        """Convierte boxes.data a enteros reutilizando el mismo buffer"""
+        datos = datos.cpu().numpy()
+        n, columnas = datos.shape
+        if n > len(self.buffer_cajas):
+            self.buffer_cajas = np.empty((n * 2, self.buffer_cajas.shape[1]), dtype=np.int64)
+        vista = self.buffer_cajas[:n, :columnas]
+        np.copyto(vista, datos, casting='unsafe')
+        return vista
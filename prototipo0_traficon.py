@@ -3,6 +3,7 @@ from ultralytics import YOLO
 import json
 from datetime import datetime
 import numpy as np
+from pool_frames import PoolFrames
 
 class SemaforoInteligente:
     def __init__(self):
@@ -143,6 +144,10 @@ def main():
     # Configuración
     fps = cap.get(cv2.CAP_PROP_FPS) or 30
     
+    # Pool de buffers para evitar reservar memoria en cada frame
+    pool = PoolFrames.desde_captura(cap)
+    frame = None
+    
     # Zona de interés (ROI)
     x1_roi, y1_roi = 80, 70
     x2_roi, y2_roi = 700, 480
@@ -172,9 +177,12 @@ def main():
     
     while cap.isOpened():
         if not paused:
-            ret, frame = cap.read()
+            # Devolver el frame anterior al pool antes de decodificar el siguiente
+            pool.devolver(frame)
+            ret, frame = pool.leer(cap)
             if not ret:
                 # Reiniciar video si llegó al final
+                frame = None
                 cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
                 continue
             frame_count += 1
@@ -192,9 +200,11 @@ def main():
         vehiculos_actuales = 0
         
         if boxes is not None and boxes.id is not None:
-            ids = boxes.id.cpu().numpy().astype(int)
-            cls = boxes.cls.cpu().numpy().astype(int)
-            coords = boxes.xyxy.cpu().numpy().astype(int)
+            # Una sola conversión a enteros: columnas (x1, y1, x2, y2, id, conf, cls)
+            datos = pool.cajas(boxes.data)
+            ids = datos[:, 4]
+            cls = datos[:, 6]
+            coords = datos[:, :4]
             
             for track_id, class_id, (x1, y1, x2, y2) in zip(ids, cls, coords):
                 cls_name = model.names[class_id]
@@ -235,10 +245,11 @@ def main():
         
         # Indicador de pausa
         if paused:
-            overlay = frame.copy()
+            overlay = pool.copiar(frame)
             cv2.rectangle(overlay, (frame.shape[1]//2 - 100, frame.shape[0]//2 - 30),
                          (frame.shape[1]//2 + 100, frame.shape[0]//2 + 30), (0, 0, 0), -1)
             cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+            pool.devolver(overlay)
             cv2.putText(frame, "PAUSADO", (frame.shape[1]//2 - 60, frame.shape[0]//2 + 5),
                         cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
         
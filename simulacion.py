@@ -5,8 +5,6 @@ import math
 # Inicialización de Pygame
 pygame.init()
 WIDTH, HEIGHT = 800, 700  # Aumenté la altura para el panel informativo
-win = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Cruce en T - Simulador con Carriles")
 
 # Colores
 GRAY = (100, 100, 100)
@@ -28,25 +26,27 @@ SPAWN_RATE = 1200  # ms entre generación de vehículos
 MIN_GREEN_TIME = 3000  # tiempo mínimo de luz verde
 MAX_GREEN_TIME = 8000  # tiempo máximo de luz verde
 YELLOW_TIME = 1500  # tiempo de luz amarilla
+MIN_GAP = 8  # separación mínima entre vehículos en cola (opcional)
 
 # Semáforo mejorado
 class TrafficLight:
-    def __init__(self, name, position):
+    def __init__(self, name, position, now=None):
         self.name = name
         self.position = position
         self.state = "RED"
-        self.last_change = pygame.time.get_ticks()
+        self.last_change = pygame.time.get_ticks() if now is None else now
         self.green_duration = MIN_GREEN_TIME
         self.yellow_duration = YELLOW_TIME
         self.waiting_vehicles = 0
         self.priority = 0
         
-    def update(self, force_green=False):
-        now = pygame.time.get_ticks()
+    def update(self, force_green=False, now=None):
+        if now is None:
+            now = pygame.time.get_ticks()
         elapsed = now - self.last_change
         
         if force_green and self.state != "GREEN":
-            self.change_to_green()
+            self.change_to_green(now)
             return
             
         if self.state == "GREEN" and elapsed > self.green_duration:
@@ -56,10 +56,10 @@ class TrafficLight:
             self.state = "RED"
             self.last_change = now
             
-    def change_to_green(self):
+    def change_to_green(self, now=None):
         if self.state != "GREEN":
             self.state = "GREEN"
-            self.last_change = pygame.time.get_ticks()
+            self.last_change = pygame.time.get_ticks() if now is None else now
             # Tiempo verde proporcional al número de vehículos esperando
             self.green_duration = min(MAX_GREEN_TIME, 
                                     MIN_GREEN_TIME + self.waiting_vehicles * 500)
@@ -237,18 +237,141 @@ def draw_info_panel(surface, lights, vehicles):
     for text, pos in texts:
         surface.blit(text, pos)
 
+# Crear los semáforos del cruce
+def create_lights(now=None):
+    return {
+        "TOP": TrafficLight("TOP", (WIDTH//2, HEIGHT//2 - 50), now),
+        "LEFT": TrafficLight("LEFT", (WIDTH//2 - 50, HEIGHT//2 + 20), now),
+        "RIGHT": TrafficLight("RIGHT", (WIDTH//2 + 50, HEIGHT//2 + 20), now)
+    }
+
+# Actualizar semáforos según los vehículos en espera
+def update_lights(lights, vehicles, now):
+    # Contar vehículos esperando en cada dirección
+    for light in lights.values():
+        light.waiting_vehicles = 0
+        light.priority = 0
+        
+    for vehicle in vehicles:
+        if vehicle.stopped and vehicle.is_at_intersection():
+            lights[vehicle.origin].waiting_vehicles += 1
+            # Prioridad aumenta con el tiempo de espera
+            lights[vehicle.origin].priority += vehicle.waiting_time / 10
+            
+    # Determinar qué semáforo debe estar en verde
+    current_green = None
+    for name, light in lights.items():
+        if light.state == "GREEN":
+            current_green = name
+            break
+            
+    # Si no hay semáforo en verde, elegir el de mayor prioridad
+    if current_green is None:
+        max_priority = max(lights.values(), key=lambda x: x.priority)
+        if max_priority.priority > 0:
+            max_priority.change_to_green(now)
+    else:
+        # Si el semáforo actual ha terminado su tiempo verde
+        current_light = lights[current_green]
+        elapsed = now - current_light.last_change
+        
+        if elapsed > current_light.green_duration:
+            # Buscar siguiente semáforo con mayor prioridad
+            next_light = max(lights.values(), key=lambda x: x.priority)
+            if next_light.priority > 0 and next_light != current_light:
+                current_light.state = "YELLOW"
+                current_light.last_change = now
+                
+    # Actualizar semáforos
+    for light in lights.values():
+        light.update(now=now)
+
+# Distancia libre hasta el vehículo de adelante en el mismo carril
+def gap_to_leader(vehicle, leader):
+    if vehicle.origin == "TOP":
+        return leader.y - (vehicle.y + vehicle.size)
+    elif vehicle.origin == "LEFT":
+        return leader.x - (vehicle.x + vehicle.size)
+    else:  # RIGHT
+        return vehicle.x - (leader.x + leader.size)
+
+# Vehículo inmediatamente adelante de cada uno en su mismo origen y carril
+def find_leaders(vehicles):
+    lanes = {}
+    for vehicle in vehicles:
+        lanes.setdefault((vehicle.origin, vehicle.lane), []).append(vehicle)
+        
+    progress = {
+        "TOP": lambda v: v.y,
+        "LEFT": lambda v: v.x,
+        "RIGHT": lambda v: -v.x
+    }
+    leaders = {}
+    for (origin, lane), lane_vehicles in lanes.items():
+        lane_vehicles.sort(key=progress[origin], reverse=True)
+        for leader, follower in zip(lane_vehicles, lane_vehicles[1:]):
+            leaders[id(follower)] = leader
+    return leaders
+
+# Mover vehículos y eliminar los que salieron de la pantalla
+def update_vehicles(lights, vehicles, surface=None, min_gap=None):
+    # Sin min_gap los vehículos se pueden encimar en la cola, como en la versión original
+    leaders = find_leaders(vehicles) if min_gap is not None else {}
+    
+    vehicles_to_remove = []
+    for i, vehicle in enumerate(vehicles):
+        prev_position = (vehicle.x, vehicle.y)
+        prev_waiting = vehicle.waiting_time
+        started_moving = vehicle.move(lights[vehicle.origin].state)
+        
+        # Quedarse detrás del vehículo de adelante si se acercaría demasiado
+        leader = leaders.get(id(vehicle))
+        if leader is not None and gap_to_leader(vehicle, leader) < min_gap:
+            vehicle.x, vehicle.y = prev_position
+            vehicle.stopped = True
+            vehicle.waiting_time = prev_waiting + 1
+            started_moving = False
+            
+        if started_moving:
+            lights[vehicle.origin].waiting_vehicles = max(0, lights[vehicle.origin].waiting_vehicles - 1)
+            
+        if surface is not None:
+            vehicle.draw(surface)
+            
+        # Eliminar vehículos que salieron de la pantalla
+        if (vehicle.x < -50 or vehicle.x > WIDTH + 50 or 
+            vehicle.y < -50 or vehicle.y > HEIGHT + 50):
+            vehicles_to_remove.append(i)
+            
+    # Eliminar vehículos en orden inverso para no afectar los índices
+    for i in sorted(vehicles_to_remove, reverse=True):
+        vehicles.pop(i)
+        
+    return len(vehicles_to_remove)
+
+# Dibujar la escena completa
+def draw_scene(surface, lights, vehicles):
+    surface.fill(GRAY)
+    draw_intersection(surface)
+    draw_info_panel(surface, lights, vehicles)
+    
+    for vehicle in vehicles:
+        vehicle.draw(surface)
+        
+    for light in lights.values():
+        light.draw(surface)
+
 # Función principal
 def main():
+    win = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Cruce en T - Simulador con Carriles")
+    
     clock = pygame.time.Clock()
     vehicles = []
     spawn_timer = 0
     
     # Semáforos
-    lights = {
-        "TOP": TrafficLight("TOP", (WIDTH//2, HEIGHT//2 - 50)),
-        "LEFT": TrafficLight("LEFT", (WIDTH//2 - 50, HEIGHT//2 + 20)),
-        "RIGHT": TrafficLight("RIGHT", (WIDTH//2 + 50, HEIGHT//2 + 20))
-    }
+    lights = create_lights()
     
     # Iniciar con un semáforo en verde
     lights["TOP"].change_to_green()
@@ -272,64 +395,11 @@ def main():
             vehicles.append(Vehicle(origin))
             spawn_timer = 0
             
-        # Contar vehículos esperando en cada dirección
-        for light in lights.values():
-            light.waiting_vehicles = 0
-            light.priority = 0
-            
-        for vehicle in vehicles:
-            if vehicle.stopped and vehicle.is_at_intersection():
-                lights[vehicle.origin].waiting_vehicles += 1
-                # Prioridad aumenta con el tiempo de espera
-                lights[vehicle.origin].priority += vehicle.waiting_time / 10
-                
-        # Determinar qué semáforo debe estar en verde
-        current_green = None
-        for name, light in lights.items():
-            if light.state == "GREEN":
-                current_green = name
-                break
-                
-        # Si no hay semáforo en verde, elegir el de mayor prioridad
-        if current_green is None:
-            max_priority = max(lights.values(), key=lambda x: x.priority)
-            if max_priority.priority > 0:
-                max_priority.change_to_green()
-        else:
-            # Si el semáforo actual ha terminado su tiempo verde
-            current_light = lights[current_green]
-            now = pygame.time.get_ticks()
-            elapsed = now - current_light.last_change
-            
-            if elapsed > current_light.green_duration:
-                # Buscar siguiente semáforo con mayor prioridad
-                next_light = max(lights.values(), key=lambda x: x.priority)
-                if next_light.priority > 0 and next_light != current_light:
-                    current_light.state = "YELLOW"
-                    current_light.last_change = now
-                    
-        # Actualizar semáforos
-        for light in lights.values():
-            light.update()
-            
+        update_lights(lights, vehicles, pygame.time.get_ticks())
+        
         # Mover y dibujar vehículos
-        vehicles_to_remove = []
-        for i, vehicle in enumerate(vehicles):
-            started_moving = vehicle.move(lights[vehicle.origin].state)
-            if started_moving:
-                lights[vehicle.origin].waiting_vehicles = max(0, lights[vehicle.origin].waiting_vehicles - 1)
-                
-            vehicle.draw(win)
-            
-            # Eliminar vehículos que salieron de la pantalla
-            if (vehicle.x < -50 or vehicle.x > WIDTH + 50 or 
-                vehicle.y < -50 or vehicle.y > HEIGHT + 50):
-                vehicles_to_remove.append(i)
-                
-        # Eliminar vehículos en orden inverso para no afectar los índices
-        for i in sorted(vehicles_to_remove, reverse=True):
-            vehicles.pop(i)
-            
+        update_vehicles(lights, vehicles, win)
+        
         # Dibujar semáforos
         for light in lights.values():
             light.draw(win)
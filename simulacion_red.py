@@ -0,0 +1,400 @@
+import argparse
+import copy
+import multiprocessing as mp
+import random
+import time
+
+# Configuración (mismas unidades que simulacion.py: px, px/frame y ms)
+FPS = 60
+STEP_MS = 1000 / FPS
+LINK_LENGTH = 300  # distancia en px entre intersecciones
+STOP_LINE = LINK_LENGTH - 20  # línea de detención antes del cruce
+MIN_GAP = 25  # separación mínima entre vehículos
+MIN_SPEED = 1.5  # velocidad mínima en px/frame
+MAX_SPEED = 2.5  # velocidad máxima en px/frame (acota sync_steps)
+SPAWN_RATE = 1200  # ms entre generación de vehículos en cada entrada
+CYCLE_TIME = 16000  # ciclo completo del semáforo (ambas fases)
+YELLOW_TIME = 1500  # tiempo de luz amarilla
+TURN_PROBABILITY = 0.2  # probabilidad de girar en cada cruce
+SYNC_STEPS = 10  # pasos entre intercambios de vehículos entre particiones
+
+# Direcciones de avance (dx, dy) y eje del semáforo que las controla
+DIRECTIONS = {"E": (1, 0), "W": (-1, 0), "S": (0, 1), "N": (0, -1)}
+AXIS = {"E": "H", "W": "H", "S": "V", "N": "V"}
+TURNS = {"E": ("N", "S"), "W": ("S", "N"), "S": ("E", "W"), "N": ("W", "E")}
+
+# Semáforo de tiempo fijo con desfase para coordinar ondas verdes
+class Junction:
+    def __init__(self, row, col, offset, seed):
+        self.row = row
+        self.col = col
+        self.offset = offset
+        # Generador propio para que el resultado no dependa del número de particiones
+        self.rng = random.Random(seed)
+
+    def state(self, axis, now):
+        half = CYCLE_TIME / 2
+        t = (now - self.offset) % CYCLE_TIME
+        green_axis = "H" if t < half else "V"
+        if axis != green_axis:
+            return "RED"
+        if t % half >= half - YELLOW_TIME:
+            return "YELLOW"
+        return "GREEN"
+
+# Vehículo sobre un tramo de calle, avanzando hacia una intersección
+class Vehicle:
+    __slots__ = ("pos", "speed", "stopped", "stops", "spawn_time", "origin")
+
+    def __init__(self, pos, speed, spawn_time, origin, stops=0):
+        self.pos = pos
+        self.speed = speed
+        self.stopped = False
+        self.stops = stops
+        self.spawn_time = spawn_time
+        self.origin = origin  # dirección con la que entró a la red
+
+    def to_tuple(self):
+        return (self.pos, self.speed, self.spawn_time, self.origin, self.stops)
+
+# Reparte la grilla en bloques de pr x pc cortando la menor cantidad de tramos
+def partition_owners(rows, cols, partitions):
+    best = None
+    for pr in range(1, partitions + 1):
+        if partitions % pr:
+            continue
+        pc = partitions // pr
+        if pr > rows or pc > cols:
+            continue
+        cut = (pc - 1) * rows + (pr - 1) * cols
+        if best is None or cut < best[0]:
+            best = (cut, pr, pc)
+    if best is None:
+        raise ValueError(f"No se puede dividir una red de {rows}x{cols} en {partitions} particiones")
+
+    _, pr, pc = best
+    row_bounds = [round(i * rows / pr) for i in range(pr + 1)]
+    col_bounds = [round(i * cols / pc) for i in range(pc + 1)]
+    owners = {}
+    for i in range(pr):
+        for j in range(pc):
+            for r in range(row_bounds[i], row_bounds[i + 1]):
+                for c in range(col_bounds[j], col_bounds[j + 1]):
+                    owners[(r, c)] = i * pc + j
+    return owners
+
+# Mayor número de particiones (hasta 'partitions') en que se puede dividir la red
+def max_partitions(rows, cols, partitions):
+    for n in range(min(partitions, rows * cols), 1, -1):
+        try:
+            partition_owners(rows, cols, n)
+            return n
+        except ValueError:
+            pass
+    return 1
+
+# Desfases de una onda verde hacia el este a la velocidad indicada (px/frame)
+def green_wave_offsets(rows, cols, speed=None):
+    offsets = {}
+    for r in range(rows):
+        for c in range(cols):
+            if speed:
+                offsets[(r, c)] = (c * LINK_LENGTH / speed * STEP_MS) % CYCLE_TIME
+            else:
+                offsets[(r, c)] = 0
+    return offsets
+
+# Región de la red (bloque de intersecciones) simulada por un proceso
+class Partition:
+    def __init__(self, index, rows, cols, owners, offsets, spawn_rate=SPAWN_RATE, seed=0):
+        self.index = index
+        self.rows = rows
+        self.cols = cols
+        self.owners = owners
+        self.spawn_rate = spawn_rate
+
+        # Intersecciones propias y los tramos que llegan a ellas: (fila, columna, dirección)
+        self.junctions = {}
+        self.links = {}
+        self.spawn_timers = {}
+        for (r, c), owner in sorted(owners.items()):
+            if owner == index:
+                junction = Junction(r, c, offsets[(r, c)], seed * 1000003 + r * cols + c)
+                self.junctions[(r, c)] = junction
+                for direction, (dx, dy) in DIRECTIONS.items():
+                    key = (r, c, direction)
+                    self.links[key] = []
+                    # Los tramos que vienen desde fuera de la red son entradas
+                    if not self.inside(r - dy, c - dx):
+                        self.spawn_timers[key] = junction.rng.uniform(0, spawn_rate)
+
+        self.stats = {
+            "spawned": 0,
+            "exited": 0,
+            "travel_time": 0.0,
+            "stops": 0,
+            "handed_off": 0
+        }
+        # Estadísticas por dirección de entrada, para evaluar la onda verde (E)
+        for direction in DIRECTIONS:
+            self.stats[f"exited_{direction}"] = 0
+            self.stats[f"travel_time_{direction}"] = 0.0
+            self.stats[f"stops_{direction}"] = 0
+
+    def inside(self, r, c):
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    def insert(self, key, vehicle):
+        # Entrar al final de la cola respetando la separación mínima
+        queue = self.links[key]
+        if queue:
+            vehicle.pos = min(vehicle.pos, queue[-1].pos - MIN_GAP)
+        queue.append(vehicle)
+
+    def spawn(self, now):
+        for key in self.spawn_timers:
+            self.spawn_timers[key] += STEP_MS
+            if self.spawn_timers[key] > self.spawn_rate:
+                rng = self.junctions[key[:2]].rng
+                self.insert(key, Vehicle(0.0, rng.uniform(MIN_SPEED, MAX_SPEED), now, key[2]))
+                self.stats["spawned"] += 1
+                self.spawn_timers[key] = 0
+
+    def route(self, junction, direction):
+        # Decidir si sigue derecho o gira, y hacia qué tramo continúa
+        if junction.rng.random() < TURN_PROBABILITY:
+            direction = junction.rng.choice(TURNS[direction])
+        dx, dy = DIRECTIONS[direction]
+        r, c = junction.row + dy, junction.col + dx
+        if not self.inside(r, c):
+            return None
+        return (r, c, direction)
+
+    def step(self, step, outbox):
+        now = step * STEP_MS
+        self.spawn(now)
+        arrivals = []
+
+        for (r, c), junction in self.junctions.items():
+            for direction in DIRECTIONS:
+                key = (r, c, direction)
+                queue = self.links[key]
+                if not queue:
+                    continue
+                green = junction.state(AXIS[direction], now) == "GREEN"
+                leader_pos = None
+                remaining = []
+
+                for vehicle in queue:
+                    target = vehicle.pos + vehicle.speed
+                    # Detenerse en la línea si el semáforo no está en verde
+                    if not green and vehicle.pos <= STOP_LINE:
+                        target = min(target, STOP_LINE)
+                    if leader_pos is not None:
+                        target = min(target, leader_pos - MIN_GAP)
+                    target = max(target, vehicle.pos)
+
+                    stopped = target - vehicle.pos < 0.1
+                    if stopped and not vehicle.stopped:
+                        vehicle.stops += 1
+                    vehicle.stopped = stopped
+
+                    if target < LINK_LENGTH:
+                        vehicle.pos = target
+                        leader_pos = target
+                        remaining.append(vehicle)
+                        continue
+
+                    # Cruzó la intersección: pasa al siguiente tramo o sale de la red
+                    vehicle.pos = target - LINK_LENGTH
+                    next_key = self.route(junction, direction)
+                    if next_key is None:
+                        travel_time = now - vehicle.spawn_time
+                        self.stats["exited"] += 1
+                        self.stats["travel_time"] += travel_time
+                        self.stats["stops"] += vehicle.stops
+                        self.stats[f"exited_{vehicle.origin}"] += 1
+                        self.stats[f"travel_time_{vehicle.origin}"] += travel_time
+                        self.stats[f"stops_{vehicle.origin}"] += vehicle.stops
+                    elif next_key in self.links:
+                        arrivals.append((next_key, vehicle))
+                    else:
+                        owner = self.owners[next_key[:2]]
+                        outbox.setdefault(owner, []).append((next_key, vehicle.to_tuple(), step + 1))
+                        self.stats["handed_off"] += 1
+
+                self.links[key] = remaining
+
+        # Los vehículos que cambian de tramo entran después de mover a todos
+        for key, vehicle in arrivals:
+            self.insert(key, vehicle)
+
+    def receive(self, inbox, step):
+        # Recibir vehículos de otras particiones y adelantarlos los pasos de retraso
+        for key, data, ready_step in inbox:
+            vehicle = Vehicle(*data)
+            vehicle.pos += (step - ready_step) * vehicle.speed
+            vehicle.pos = min(vehicle.pos, STOP_LINE)
+            self.insert(key, vehicle)
+
+    def run(self, inbox, start_step, n_steps):
+        # Tiempo de CPU: no cuenta el tiempo en que el proceso espera un núcleo libre
+        inicio = time.process_time()
+        self.receive(inbox, start_step)
+        outbox = {}
+        for step in range(start_step, start_step + n_steps):
+            self.step(step, outbox)
+        return outbox, time.process_time() - inicio
+
+    def summary(self):
+        summary = dict(self.stats)
+        summary["active"] = sum(len(queue) for queue in self.links.values())
+        return summary
+
+# Proceso que mantiene una partición y la avanza a pedido
+def partition_worker(conn, partition):
+    while True:
+        message = conn.recv()
+        if message is None:
+            conn.send(partition.summary())
+            break
+        inbox, start_step, n_steps = message
+        conn.send(partition.run(inbox, start_step, n_steps))
+    conn.close()
+
+# Red de intersecciones en grilla (un corredor es una grilla de una fila)
+class RoadNetwork:
+    def __init__(self, rows, cols, partitions=1, green_wave_speed=None,
+                 spawn_rate=SPAWN_RATE, sync_steps=SYNC_STEPS, seed=0):
+        if not 1 <= partitions <= rows * cols:
+            raise ValueError("El número de particiones debe estar entre 1 y el número de intersecciones")
+        if sync_steps < 1:
+            raise ValueError("sync_steps debe ser al menos 1")
+        if sync_steps * MAX_SPEED >= LINK_LENGTH:
+            raise ValueError("sync_steps es demasiado grande para la longitud de los tramos")
+        self.rows = rows
+        self.cols = cols
+        self.sync_steps = sync_steps
+        owners = partition_owners(rows, cols, partitions)
+        offsets = green_wave_offsets(rows, cols, green_wave_speed)
+        self.partitions = [Partition(i, rows, cols, owners, offsets, spawn_rate, seed)
+                           for i in range(partitions)]
+
+    def run(self, duration):
+        """Simula la red durante 'duration' segundos y devuelve las estadísticas.
+
+        Cada llamada parte del estado inicial de la red, sin importar el número
+        de particiones (los procesos reciben copias de las particiones).
+        """
+        total_steps = int(duration * FPS)
+        if total_steps < 1:
+            raise ValueError("La duración debe ser positiva y cubrir al menos un paso")
+        inboxes = [[] for _ in self.partitions]
+        # Tiempo de cálculo total y el de la partición más lenta en cada intercambio
+        compute_time = 0.0
+        critical_path = 0.0
+
+        if len(self.partitions) == 1:
+            partition = copy.deepcopy(self.partitions[0])
+            for start in range(0, total_steps, self.sync_steps):
+                _, elapsed = partition.run([], start, min(self.sync_steps, total_steps - start))
+                compute_time += elapsed
+            summaries = [partition.summary()]
+            return self.collect(summaries, total_steps, compute_time, compute_time)
+
+        # Un proceso por partición; el proceso principal reparte los traspasos
+        connections = []
+        workers = []
+        finished = False
+        try:
+            for partition in self.partitions:
+                parent_conn, child_conn = mp.Pipe()
+                worker = mp.Process(target=partition_worker, args=(child_conn, partition), daemon=True)
+                worker.start()
+                child_conn.close()
+                connections.append(parent_conn)
+                workers.append(worker)
+
+            for start in range(0, total_steps, self.sync_steps):
+                n_steps = min(self.sync_steps, total_steps - start)
+                for conn, inbox in zip(connections, inboxes):
+                    conn.send((inbox, start, n_steps))
+                inboxes = [[] for _ in self.partitions]
+                slowest = 0.0
+                for conn in connections:
+                    outbox, elapsed = conn.recv()
+                    for owner, handoffs in outbox.items():
+                        inboxes[owner].extend(handoffs)
+                    compute_time += elapsed
+                    slowest = max(slowest, elapsed)
+                critical_path += slowest
+
+            summaries = []
+            for conn in connections:
+                conn.send(None)
+                summaries.append(conn.recv())
+            finished = True
+        finally:
+            # Ante un error los procesos siguen esperando en recv(): hay que terminarlos
+            for worker in workers:
+                if not finished and worker.is_alive():
+                    worker.terminate()
+                worker.join()
+            for conn in connections:
+                conn.close()
+
+        # Vehículos traspasados que todavía no se entregaron
+        summaries[0]["active"] += sum(len(inbox) for inbox in inboxes)
+        return self.collect(summaries, total_steps, compute_time, critical_path)
+
+    def collect(self, summaries, total_steps, compute_time, critical_path):
+        totals = {key: sum(s[key] for s in summaries) for key in summaries[0]}
+        exited = totals["exited"]
+        totals["avg_travel_time"] = totals["travel_time"] / exited / 1000 if exited else 0.0
+        totals["avg_stops"] = totals["stops"] / exited if exited else 0.0
+        for direction in DIRECTIONS:
+            exited_dir = totals[f"exited_{direction}"]
+            totals[f"avg_travel_time_{direction}"] = (
+                totals[f"travel_time_{direction}"] / exited_dir / 1000 if exited_dir else 0.0)
+            totals[f"avg_stops_{direction}"] = (
+                totals[f"stops_{direction}"] / exited_dir if exited_dir else 0.0)
+        totals["simulated_time"] = total_steps * STEP_MS / 1000
+        # Si cada partición tuviera su propio núcleo, el cálculo duraría critical_path
+        totals["compute_time"] = compute_time
+        totals["critical_path"] = critical_path
+        return totals
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulación de una red de intersecciones en paralelo")
+    parser.add_argument("--rows", type=int, default=4, help="filas de la grilla (1 = corredor)")
+    parser.add_argument("--cols", type=int, default=8, help="intersecciones por fila")
+    parser.add_argument("--partitions", type=int, default=mp.cpu_count(), help="procesos en paralelo")
+    parser.add_argument("--duration", type=float, default=120.0, help="segundos simulados")
+    parser.add_argument("--green-wave", type=float, default=None,
+                        help="velocidad (px/frame) de la onda verde hacia el este")
+    parser.add_argument("--spawn-rate", type=int, default=SPAWN_RATE)
+    parser.add_argument("--sync-steps", type=int, default=SYNC_STEPS)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    network = RoadNetwork(args.rows, args.cols, max_partitions(args.rows, args.cols, args.partitions),
+                          args.green_wave, args.spawn_rate, args.sync_steps, args.seed)
+    inicio = time.perf_counter()
+    stats = network.run(args.duration)
+    elapsed = time.perf_counter() - inicio
+
+    print(f"Red {args.rows}x{args.cols} en {len(network.partitions)} particiones")
+    print(f"Tiempo simulado: {stats['simulated_time']:.1f}s  Tiempo real: {elapsed:.2f}s")
+    print(f"Vehículos generados: {stats['spawned']}  Salidos: {stats['exited']}  En red: {stats['active']}")
+    print(f"Traspasos entre particiones: {stats['handed_off']}")
+    print(f"Cálculo total: {stats['compute_time']:.2f}s  Camino crítico: {stats['critical_path']:.2f}s  "
+          f"Aceleración ideal: {stats['compute_time'] / stats['critical_path']:.2f}x")
+    print(f"Tiempo de viaje promedio: {stats['avg_travel_time']:.1f}s  Detenciones promedio: {stats['avg_stops']:.2f}")
+    print("Por dirección de entrada (la onda verde favorece a E):")
+    for direction in DIRECTIONS:
+        print(f"  {direction}: salidos {stats[f'exited_{direction}']:5d}  "
+              f"viaje {stats[f'avg_travel_time_{direction}']:5.1f}s  "
+              f"detenciones {stats[f'avg_stops_{direction}']:.2f}")
+
+if __name__ == "__main__":
+    main()